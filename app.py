@@ -6,14 +6,15 @@ from kivymd.uix.button import MDRaisedButton
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.spinner import MDSpinner
 from kivy.clock import Clock, mainthread
-from concurrent.futures import ThreadPoolExecutor
 import aiosqlite
 import numpy as np
-import pennylane as qml
 import httpx
 import json
 import logging
+import contextlib
 from kivy.lang import Builder
+from config import CONFIG
+from quantum import ANGLE_SCALE, circuit
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
@@ -29,70 +30,111 @@ BoxLayout:
         size: dp(46), dp(46)
         pos_hint: {'center_x': 0.5, 'center_y': 0.5}
         active: False
+    ScrollView:
+        MDLabel:
+            id: result_label
+            text: ""
+            size_hint_y: None
+            height: self.texture_size[1]
 '''
 
 class QuantumNetworkAnalysisApp(MDApp):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        with open('config.json', 'r') as config_file:
-            self.config_data = json.load(config_file)
-        self.openai_api_key = self.config_data['openai_api_key']
-        self.executor = ThreadPoolExecutor(max_workers=4)
+    async def app_func(self):
+        async with contextlib.AsyncExitStack() as stack:
+            self.http = await stack.enter_async_context(httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=20),
+                timeout=30
+            ))
+            self.db = await stack.enter_async_context(aiosqlite.connect(CONFIG.database_path))
+            for pragma in ("PRAGMA journal_mode=WAL", "PRAGMA synchronous=NORMAL"):
+                try:
+                    async with self.db.execute(pragma):
+                        pass
+                except aiosqlite.Error as e:
+                    logging.warning(f"Could not apply {pragma}: {e}")
+            await self.async_run(async_lib='asyncio')
 
     def build(self):
+        self.timestamps = []
+        self.insights = []
+        self.refresh_insights = Clock.create_trigger(self.update_result_label)
+        self.analysis_task = None
         return Builder.load_string(KV)
 
+    def update_result_label(self, dt):
+        self.root.ids.result_label.text = "\n\n".join(
+            f"{timestamp}: {text}" for timestamp, text in zip(self.timestamps, self.insights)
+        )
+
     def start_analysis(self):
-        Clock.schedule_once(lambda dt: asyncio.ensure_future(self.fetch_and_analyze_data()))
+        if self.analysis_task is not None and not self.analysis_task.done():
+            return
+        self.analysis_task = asyncio.ensure_future(self.fetch_and_analyze_data())
 
     async def fetch_and_analyze_data(self):
         self.root.ids.spinner.active = True
         try:
-            async with aiosqlite.connect('network_data.db') as db:
-                async with db.execute("SELECT ping, jitter, download_speed, upload_speed, timestamp FROM network_logs ORDER BY timestamp DESC LIMIT 20") as cursor:
-                    rows = await cursor.fetchall()
-                    for row in rows:
-                        await self.analyze_and_display_data(row)
+            async with self.db.execute("SELECT ping, jitter, download_speed, upload_speed, timestamp FROM network_logs ORDER BY timestamp DESC LIMIT 20") as cursor:
+                rows = await cursor.fetchall()
+            if rows:
+                results = self.quantum_circuit_analysis(rows)
+                self.timestamps = [row[4] for row in rows]
+                self.insights = [""] * len(rows)
+                outcomes = await asyncio.gather(*[
+                    self.analyze_and_display_data(index, quantum_results)
+                    for index, quantum_results in enumerate(results)
+                ], return_exceptions=True)
+                for index, outcome in enumerate(outcomes):
+                    if isinstance(outcome, BaseException):
+                        logging.error(f"Error generating insights for {self.timestamps[index]}: {outcome!r}")
+                        self.insights[index] = f"[error: {type(outcome).__name__}]"
+                        self.refresh_insights()
         except Exception as e:
             logging.error(f"Error fetching and analyzing data: {e}")
         finally:
             self.root.ids.spinner.active = False
 
-    async def analyze_and_display_data(self, row):
-        ping, jitter, download_speed, upload_speed, timestamp = row
-        quantum_results = self.quantum_circuit_analysis(ping, jitter, download_speed, upload_speed)
-        insights = await asyncio.get_event_loop().run_in_executor(self.executor, self.run_generate_insights_with_ai, quantum_results)
-        logging.info(f"Timestamp: {timestamp}, Insights: {insights}")
-
-    def run_generate_insights_with_ai(self, quantum_results):
-        return asyncio.run(self.generate_insights_with_ai(quantum_results))
+    async def analyze_and_display_data(self, index, quantum_results):
+        async for chunk in self.generate_insights_with_ai(quantum_results):
+            self.insights[index] += chunk
+            self.refresh_insights()
+        logging.info(f"Timestamp: {self.timestamps[index]}, Insights: {self.insights[index]}")
 
     async def generate_insights_with_ai(self, quantum_results):
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://api.openai.com/v1/completions",
-                headers={"Authorization": f"Bearer {self.openai_api_key}"},
-                json={
-                    "model": "text-davinci-003",
-                    "prompt": f"Analyze networking data with quantum results {quantum_results}",
-                    "max_tokens": 100
-                }
-            )
-            data = response.json()
-            return data['choices'][0]['text']
+        probs = ",".join(f"{p:.3f}" for p in quantum_results)
+        async with self.http.stream(
+            "POST",
+            "https://api.openai.com/v1/chat/completions",
+            headers={"Authorization": f"Bearer {CONFIG.openai_api_key}"},
+            json={
+                "model": "gpt-4o-mini",
+                "messages": [
+                    {"role": "user", "content": f"Analyze networking data with quantum results {probs}"}
+                ],
+                "max_tokens": 100,
+                "stream": True
+            }
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                raise httpx.HTTPStatusError(
+                    f"OpenAI request failed with {response.status_code}: {response.text}",
+                    request=response.request,
+                    response=response
+                )
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                payload = line[5:].strip()
+                if payload == "[DONE]":
+                    break
+                yield json.loads(payload)['choices'][0]['delta'].get('content') or ''
 
-    def quantum_circuit_analysis(self, ping, jitter, download_speed, upload_speed):
-        dev = qml.device('default.qubit', wires=4)
-        @qml.qnode(dev)
-        def circuit():
-            qml.RY(np.pi * ping / 100, wires=0)
-            qml.RY(np.pi * jitter / 50, wires=1)
-            qml.RY(np.pi * download_speed / 1000, wires=2)
-            qml.RY(np.pi * upload_speed / 500, wires=3)
-            qml.CNOT(wires=[0, 1])
-            qml.CNOT(wires=[1, 2])
-            qml.CNOT(wires=[2, 3])
-            return qml.probs(wires=[0, 1, 2, 3])
+    def quantum_circuit_analysis(self, rows):
+        angles = np.array([row[:4] for row in rows], dtype=np.float32) * ANGLE_SCALE
+        probs = circuit(angles)
+        probs.flags.writeable = False
+        return probs
 
 if __name__ == "__main__":
-    QuantumNetworkAnalysisApp().run()
+    asyncio.run(QuantumNetworkAnalysisApp().app_func())
@@ -0,0 +1,12 @@
+import json
+from dataclasses import dataclass, fields
+
+@dataclass(frozen=True, slots=True)
+class Cfg:
+    openai_api_key: str
+    database_path: str = 'network_data.db'
+
+with open('config.json', 'r') as config_file:
+    _data = json.load(config_file)
+
+CONFIG = Cfg(**{f.name: _data[f.name] for f in fields(Cfg) if f.name in _data})
@@ -0,0 +1,25 @@
+import numpy as np
+
+# ping, jitter, download_speed, upload_speed
+NORMS = np.array([100, 50, 1000, 500], dtype=np.float32)
+ANGLE_SCALE = (np.pi / NORMS).astype(np.float32)
+
+def _cnot(control, target):
+    matrix = np.zeros((16, 16), dtype=np.float32)
+    for i in range(16):
+        bits = [(i >> (3 - wire)) & 1 for wire in range(4)]
+        bits[target] ^= bits[control]
+        j = sum(bit << (3 - wire) for wire, bit in enumerate(bits))
+        matrix[j, i] = 1
+    return matrix
+
+# RY on each wire followed by CNOT(0,1), CNOT(1,2), CNOT(2,3); wire 0 is the most significant bit
+CNOT_LADDER = _cnot(2, 3) @ _cnot(1, 2) @ _cnot(0, 1)
+
+def circuit(angles):
+    amplitudes = np.stack([np.cos(angles / 2), np.sin(angles / 2)], axis=-1)
+    states = np.einsum(
+        'bi,bj,bk,bl->bijkl',
+        amplitudes[:, 0], amplitudes[:, 1], amplitudes[:, 2], amplitudes[:, 3]
+    ).reshape(-1, 16)
+    return np.abs(np.einsum('ij,bj->bi', CNOT_LADDER, states)) ** 2
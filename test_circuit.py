@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from quantum import circuit
+
+qml = pytest.importorskip("pennylane")
+
+dev = qml.device('default.qubit', wires=4)
+
+@qml.qnode(dev)
+def reference_circuit(angles):
+    qml.RY(angles[0], wires=0)
+    qml.RY(angles[1], wires=1)
+    qml.RY(angles[2], wires=2)
+    qml.RY(angles[3], wires=3)
+    qml.CNOT(wires=[0, 1])
+    qml.CNOT(wires=[1, 2])
+    qml.CNOT(wires=[2, 3])
+    return qml.probs(wires=[0, 1, 2, 3])
+
+def test_circuit_matches_default_qubit():
+    rng = np.random.default_rng(0)
+    angles = (rng.random((8, 4)) * np.pi).astype(np.float32)
+    expected = np.array([reference_circuit(a) for a in angles])
+    np.testing.assert_allclose(circuit(angles), expected, atol=1e-6)